@@ -1,15 +1,22 @@
 """
 FastAPI Backend for Predictive Maintenance System
 """
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.responses import HTMLResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
+from anyio import to_thread
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Annotated, List, Literal, Optional
+from contextlib import asynccontextmanager
+import numpy as np
 import uvicorn
 from datetime import datetime
+import asyncio
 import os
+import time
 import config
 from model_inference import get_model_inference
 from monitoring_service import router as monitoring_router, get_monitoring_service
@@ -18,13 +25,23 @@ from monitoring_service import router as monitoring_router, get_monitoring_servi
 # Pydantic models for request/response validation
 class SensorData(BaseModel):
     machine_id: str = Field(..., description="Unique machine identifier")
-    Type: str = Field(..., description="Machine type (L, M, or H)", pattern="^[LMH]$")
+    Type: Literal["L", "M", "H"] = Field(..., description="Machine type (L, M, or H)")
     air_temperature: float = Field(..., alias="Air temperature [K]", ge=290, le=310)
     process_temperature: float = Field(..., alias="Process temperature [K]", ge=300, le=320)
     rotational_speed: int = Field(..., alias="Rotational speed [rpm]", ge=1000, le=3000)
     torque: float = Field(..., alias="Torque [Nm]", ge=0, le=100)
     tool_wear: int = Field(..., alias="Tool wear [min]", ge=0, le=300)
     
+    def to_array(self) -> np.ndarray:
+        """Sensor values in model_inference.SENSOR_COLUMNS order"""
+        return np.array([
+            self.air_temperature,
+            self.process_temperature,
+            self.rotational_speed,
+            self.torque,
+            self.tool_wear
+        ], dtype=np.float64)
+    
     class Config:
         populate_by_name = True
         json_schema_extra = {
@@ -47,11 +64,17 @@ class PredictionResponse(BaseModel):
     normal_probability: float
     health_status: str
     alert: bool
-    timestamp: str
+    timestamp: Optional[str] = None  # Batch results carry it on the envelope as well
 
 
 class BatchSensorData(BaseModel):
-    machines: List[SensorData]
+    machines: List[SensorData] = Field(..., min_length=1)
+
+
+class BatchPredictionResponse(BaseModel):
+    predictions: List[dict]  # Full results, including the echoed sensor_data
+    total_machines: int
+    timestamp: str
 
 
 class ModelInfo(BaseModel):
@@ -62,44 +85,24 @@ class ModelInfo(BaseModel):
     status: str
 
 
-# Initialize FastAPI app
-app = FastAPI(
-    title="Predictive Maintenance API",
-    description="AI-driven predictive maintenance system for industrial equipment monitoring",
-    version="1.0.0"
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Mount static files
-static_dir = os.path.join(os.path.dirname(__file__), "static")
-if os.path.exists(static_dir):
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
-
-# Include monitoring service router
-app.include_router(monitoring_router)
-
 # Global model inference instance
 model_inference = None
 monitoring_service = None
 
 
-@app.on_event("startup")
-async def startup_event():
+@asynccontextmanager
+async def lifespan(app):
     """Initialize model and monitoring service on startup"""
     global model_inference, monitoring_service
+    simulation_task = None
     try:
         print("🚀 Starting Predictive Maintenance API...")
         print(f"📍 Environment: {config.ENV}")
         print(f"🔌 Port: {config.API_PORT}")
         
+        # Allow more blocking inference calls to run in parallel worker threads
+        to_thread.current_default_thread_limiter().total_tokens = config.THREADPOOL_SIZE
+        
         # Load model with error handling
         try:
             model_inference = get_model_inference()
@@ -109,6 +112,14 @@ async def startup_event():
             print("⚠️  API will run in limited mode without predictions")
             model_inference = None
         
+        # Warm up the model so the first real request sees steady-state latency
+        if model_inference and model_inference.model_loaded:
+            try:
+                model_inference.predict(dict(SensorData.model_config["json_schema_extra"]["example"]))
+                print("✓ Model warmed up")
+            except Exception as warmup_error:
+                print(f"⚠️  Warning: Model warmup failed: {warmup_error}")
+        
         # Initialize monitoring service
         try:
             monitoring_service = get_monitoring_service()
@@ -117,18 +128,80 @@ async def startup_event():
             print(f"⚠️  Warning: Monitoring service failed: {monitor_error}")
             monitoring_service = None
         
+        # Optionally keep the simulator ticking in the background
+        if config.BACKGROUND_SIMULATION and monitoring_service:
+            simulation_task = asyncio.create_task(
+                monitoring_service.simulator.run_continuous_simulation_async()
+            )
+            print("✓ Background simulation started")
+        
         print("✓ Predictive Maintenance API started successfully")
     except Exception as e:
         print(f"❌ Startup error: {e}")
         import traceback
         traceback.print_exc()
         # Don't raise - let the app start anyway for health checks
+    
+    yield
+    
+    if simulation_task:
+        simulation_task.cancel()
+        try:
+            await simulation_task
+        except asyncio.CancelledError:
+            pass
+        except Exception as sim_error:
+            # The task may have died before shutdown; don't let that fail the lifespan
+            print(f"⚠️  Warning: Background simulation stopped with an error: {sim_error}")
 
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with API information"""
-    html_content = """
+# Initialize FastAPI app
+app = FastAPI(
+    title="Predictive Maintenance API",
+    description="AI-driven predictive maintenance system for industrial equipment monitoring",
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Compress large responses such as /predict/batch (registered first so it runs innermost)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+# Configure CORS
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+# Mount static files
+static_dir = os.path.join(os.path.dirname(__file__), "static")
+if os.path.exists(static_dir):
+    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+
+# Dashboard location, checked once instead of on every request
+_DASHBOARD_PATH = os.path.join(static_dir, "dashboard.html")
+if not os.path.exists(_DASHBOARD_PATH):
+    _DASHBOARD_PATH = None
+
+# Include monitoring service router
+app.include_router(monitoring_router)
+
+# Formatted timestamp cache: [epoch second, isoformat string]
+_ts_cache = [0, ""]
+
+
+def _iso_now_cached():
+    """Return the current time as an ISO string, formatted at most once per second"""
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[:] = [t, datetime.fromtimestamp(t).isoformat()]
+    return _ts_cache[1]
+
+
+# Root page, encoded once at import time
+_ROOT_HTML_BYTES = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -178,8 +251,16 @@ async def root():
         </div>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html_content)
+    """.encode("utf-8")
+
+# Let browsers cache the static root page
+_ROOT_HEADERS = {"Cache-Control": "public, max-age=300"}
+
+
+@app.get("/", response_class=HTMLResponse)
+async def root():
+    """Root endpoint with API information"""
+    return HTMLResponse(content=_ROOT_HTML_BYTES, headers=_ROOT_HEADERS)
 
 
 @app.get("/health")
@@ -187,7 +268,7 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": _iso_now_cached(),
         "model_loaded": model_inference.model_loaded if model_inference else False
     }
 
@@ -212,14 +293,14 @@ async def predict_single(sensor_data: SensorData):
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     try:
-        # Convert Pydantic model to dict
-        data_dict = sensor_data.model_dump(by_alias=True)
-        
-        # Make prediction
-        result = model_inference.predict(data_dict)
-        
-        # Add timestamp
-        result['timestamp'] = datetime.now().isoformat()
+        # Make prediction off the event loop, straight from the validated fields
+        result = await run_in_threadpool(
+            model_inference.predict_row,
+            sensor_data.to_array(),
+            sensor_data.Type,
+            sensor_data.machine_id,
+            timestamp=_iso_now_cached()
+        )
         
         return result
         
@@ -227,7 +308,7 @@ async def predict_single(sensor_data: SensorData):
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
 
 
-@app.post("/predict/batch")
+@app.post("/predict/batch", response_model=BatchPredictionResponse)
 async def predict_batch(batch_data: BatchSensorData):
     """
     Make predictions for multiple machines
@@ -238,16 +319,18 @@ async def predict_batch(batch_data: BatchSensorData):
         raise HTTPException(status_code=503, detail="Model not loaded")
     
     try:
-        # Convert Pydantic models to dicts
-        machines_data = [machine.model_dump(by_alias=True) for machine in batch_data.machines]
-        
-        # Make predictions
-        results = model_inference.predict(machines_data)
+        machines = batch_data.machines
+        timestamp = _iso_now_cached()
         
-        # Add timestamps
-        timestamp = datetime.now().isoformat()
-        for result in results:
-            result['timestamp'] = timestamp
+        # Make predictions off the event loop, straight from the validated fields;
+        # rows are stamped while the results are built rather than in a second pass
+        results = await run_in_threadpool(
+            model_inference.predict_rows,
+            np.stack([machine.to_array() for machine in machines]),
+            [machine.Type for machine in machines],
+            [machine.machine_id for machine in machines],
+            timestamp=timestamp
+        )
         
         return {
             "predictions": results,
@@ -259,13 +342,22 @@ async def predict_batch(batch_data: BatchSensorData):
         raise HTTPException(status_code=500, detail=f"Batch prediction error: {str(e)}")
 
 
+@app.post("/predict-batch", response_model=BatchPredictionResponse)
+async def predict_batch_list(machines: Annotated[List[SensorData], Body(min_length=1)]):
+    """
+    Make predictions for a bare list of machines
+    
+    Same validation and response as /predict/batch, for clients that post
+    the records without the {"machines": [...]} envelope
+    """
+    return await predict_batch(BatchSensorData(machines=machines))
+
+
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard():
     """Serve the dashboard"""
-    dashboard_path = os.path.join(os.path.dirname(__file__), "static", "dashboard.html")
-    
-    if os.path.exists(dashboard_path):
-        return FileResponse(dashboard_path)
+    if _DASHBOARD_PATH:
+        return FileResponse(_DASHBOARD_PATH)
     else:
         return HTMLResponse(content="""
         <!DOCTYPE html>
@@ -299,7 +391,10 @@ if __name__ == "__main__":
             host=config.API_HOST,
             port=config.API_PORT,
             log_level="info",
-            access_log=True
+            access_log=config.ACCESS_LOG,
+            loop=config.SERVER_LOOP,
+            http=config.SERVER_HTTP,
+            lifespan="on"
         )
     except Exception as e:
         print(f"❌ Failed to start server: {e}")
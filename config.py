@@ -3,6 +3,7 @@ Configuration file for Predictive Maintenance System
 Supports both local development and production deployment
 """
 import os
+import sys
 
 # Environment
 ENV = os.getenv('ENV', 'development')  # development or production
@@ -16,6 +17,7 @@ LOGS_DIR = os.path.join(BASE_DIR, "logs")
 
 # Dataset
 DATASET_PATH = os.path.join(DATA_DIR, "ai4i2020.csv")
+PREPROCESSED_CACHE_DIR = os.path.join(DATA_DIR, "cache")  # Preprocessed copies keyed by CSV hash
 
 # Model parameters
 RANDOM_STATE = 42
@@ -32,8 +34,16 @@ TARGET_COLUMN = 'Machine failure'
 API_HOST = os.getenv('HOST', '0.0.0.0')
 API_PORT = int(os.getenv('PORT', 8000))
 
+# Server - uvloop/httptools event loop and HTTP parser (uvloop is unavailable on Windows)
+SERVER_LOOP = 'asyncio' if sys.platform == 'win32' else 'uvloop'
+SERVER_HTTP = 'httptools'
+ACCESS_LOG = DEBUG  # Per-request access logging only in development
+THREADPOOL_SIZE = 64  # Worker threads available for blocking model inference
+PREDICTION_CACHE_SIZE = 10_000  # Recent sensor readings whose predictions are memoized
+
 # Real-time simulation
 SIMULATION_INTERVAL = 2  # seconds
+BACKGROUND_SIMULATION = os.getenv('BACKGROUND_SIMULATION', 'false').lower() == 'true'  # Tick simulator inside the API process
 NUM_MACHINES = 5
 FAILURE_THRESHOLD = 0.6  # Probability threshold for maintenance alert
 
@@ -2,61 +2,220 @@
 Real-time Data Simulator for Predictive Maintenance System
 Simulates realistic sensor data for multiple machines
 """
+import asyncio
 import numpy as np
-import random
+import sys
+import threading
 import time
 import config
 from datetime import datetime
 import json
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to plain Python
+    def njit(*args, **kwargs):
+        return lambda f: f
+
+
+# Initial tool wear and sensor baseline ranges per starting condition
+_INITIAL_CONDITIONS = {
+    # Healthy condition: low wear, optimal sensor values
+    'healthy': {
+        'tool_wear': (5, 45),
+        'air_temp_baseline': (296, 299.5),  # Lower, optimal range
+        'process_temp_baseline': (306, 309.5),  # Lower, optimal range
+        'speed_baseline': (1600, 2100),  # Higher speed
+        'torque_baseline': (22, 38),  # Lower torque
+        'degradation_rate': (0.15, 0.3),  # Very slow
+    },
+    # At risk: approaching maintenance threshold (30-60% failure probability)
+    # Need values very similar to maintenance but slightly better
+    'risk': {
+        'tool_wear': (165, 185),  # High wear, approaching maintenance
+        'air_temp_baseline': (301, 303),  # Elevated
+        'process_temp_baseline': (311.2, 312.8),  # High
+        'speed_baseline': (1240, 1300),  # Low speed
+        'torque_baseline': (63, 68),  # Very high torque
+        'degradation_rate': (0.2, 0.35),  # Controlled
+    },
+    # Maintenance required: high wear, clearly degraded sensor values
+    'maintenance': {
+        'tool_wear': (180, 220),  # Very high wear
+        'air_temp_baseline': (301, 303.5),  # Elevated
+        'process_temp_baseline': (311, 313),  # Very high
+        'speed_baseline': (1220, 1320),  # Low speed
+        'torque_baseline': (62, 70),  # Very high torque
+        'degradation_rate': (0.2, 0.35),  # Controlled
+    },
+    # Default to healthy
+    'default': {
+        'tool_wear': (5, 40),
+        'air_temp_baseline': (296, 300),
+        'process_temp_baseline': (306, 310),
+        'speed_baseline': (1500, 2000),
+        'torque_baseline': (25, 40),
+        'degradation_rate': (0.2, 0.4),
+    },
+}
+
+# Noise standard deviations for air temp, process temp, speed and torque
+_NOISE_SIGMAS = np.array([0.2, 0.3, 20, 1.5])
+
+# Sensor clip bounds, resolved once at import time
+_AIR_LO, _AIR_HI = config.SENSOR_RANGES['Air temperature [K]']
+_PROC_LO, _PROC_HI = config.SENSOR_RANGES['Process temperature [K]']
+_SPEED_LO, _SPEED_HI = config.SENSOR_RANGES['Rotational speed [rpm]']
+_TORQUE_LO, _TORQUE_HI = config.SENSOR_RANGES['Torque [Nm]']
+_WEAR_LO, _WEAR_HI = config.SENSOR_RANGES['Tool wear [min]']
+
+# The same bounds as rows of (lo, hi) for air temp, process temp, speed, torque and
+# tool wear; passed to _tick as an argument because numba would otherwise freeze
+# the globals into its on-disk cache and miss later config changes
+_CLIP_BOUNDS = np.array([
+    (_AIR_LO, _AIR_HI),
+    (_PROC_LO, _PROC_HI),
+    (_SPEED_LO, _SPEED_HI),
+    (_TORQUE_LO, _TORQUE_HI),
+    (_WEAR_LO, _WEAR_HI),
+], dtype=np.float64)
+
+# Machine types available for simulation
+SENSOR_TYPES = tuple(config.SENSOR_RANGES['Type'])
+
+# Shared random generator for all simulators
+_RNG = np.random.default_rng()
+
+
+@njit(cache=True)
+def _clip(x, lo, hi):
+    """Clip a scalar to [lo, hi] without going through NumPy"""
+    return lo if x < lo else (hi if x > hi else x)
+
+
+# cache=True stores the compiled kernels on disk, so the compile cost is
+# only paid on the very first call rather than on every process start
+@njit(cache=True, fastmath=True)
+def _tick(tool_wear, air_base, speed_base, torque_base, deg_rate, noise, uniforms, bounds):
+    """
+    Advance one machine by one tick
+    
+    Args:
+        noise: Gaussian noise for air temp, process temp, speed and torque
+        uniforms: Three U[0, 1) draws for wear increment, process temp offset
+                  and high-wear torque increase
+        bounds: Clip bounds laid out as _CLIP_BOUNDS
+    
+    Returns:
+        tuple: (tool_wear, air_temp, process_temp, speed, torque)
+    """
+    # GRADUAL tool wear increase (much slower, realistic)
+    wear_increment = deg_rate * (0.1 + 0.2 * uniforms[0])  # Very small increments
+    tool_wear = min(tool_wear + wear_increment, bounds[4, 1])
+    
+    # Air temperature - very slow variations
+    air_temp = _clip(air_base + noise[0], bounds[0, 0], bounds[0, 1])
+    
+    # Process temperature - correlated with air temp, slightly increases with tool wear
+    wear_factor = tool_wear / 250.0  # 0 to 1
+    process_temp_base = air_temp + 8.0 + 4.0 * uniforms[1]
+    process_temp_noise = noise[1] + wear_factor * 1.0  # Reduced impact
+    process_temp = _clip(process_temp_base + process_temp_noise, bounds[1, 0], bounds[1, 1])
+    
+    # Rotational speed - very stable with minor variations
+    speed = _clip(speed_base + noise[2], bounds[2, 0], bounds[2, 1])
+    
+    # Torque - stable with slight variations based on wear
+    base_torque = torque_base
+    if wear_factor > 0.6:  # High wear increases torque slightly
+        base_torque += 3.0 * uniforms[2]  # Reduced from 10
+    torque = _clip(base_torque + noise[3], bounds[3, 0], bounds[3, 1])
+    
+    return tool_wear, air_temp, process_temp, speed, torque
+
 
 class MachineSimulator:
     """
-    Simulates sensor data for a single machine
+    Thin view onto a single machine's state inside a DataSimulator
     """
     
-    def __init__(self, machine_id, machine_type=None, initial_condition='healthy'):
-        self.machine_id = machine_id
-        self.machine_type = machine_type or random.choice(config.SENSOR_RANGES['Type'])
-        
-        # Set initial tool wear and sensor baselines based on condition
-        if initial_condition == 'healthy':
-            # Healthy condition: low wear, optimal sensor values
-            self.tool_wear = random.uniform(5, 45)
-            self.air_temp_baseline = random.uniform(296, 299.5)  # Lower, optimal range
-            self.process_temp_baseline = random.uniform(306, 309.5)  # Lower, optimal range
-            self.speed_baseline = random.uniform(1600, 2100)  # Higher speed
-            self.torque_baseline = random.uniform(22, 38)  # Lower torque
-            self.degradation_rate = random.uniform(0.15, 0.3)  # Very slow
-        elif initial_condition == 'risk':
-            # At risk: approaching maintenance threshold (30-60% failure probability)
-            # Need values very similar to maintenance but slightly better
-            self.tool_wear = random.uniform(165, 185)  # High wear, approaching maintenance
-            self.air_temp_baseline = random.uniform(301, 303)  # Elevated
-            self.process_temp_baseline = random.uniform(311.2, 312.8)  # High
-            self.speed_baseline = random.uniform(1240, 1300)  # Low speed
-            self.torque_baseline = random.uniform(63, 68)  # Very high torque
-            self.degradation_rate = random.uniform(0.2, 0.35)  # Controlled
-        elif initial_condition == 'maintenance':
-            # Maintenance required: high wear, clearly degraded sensor values
-            self.tool_wear = random.uniform(180, 220)  # Very high wear
-            self.air_temp_baseline = random.uniform(301, 303.5)  # Elevated
-            self.process_temp_baseline = random.uniform(311, 313)  # Very high
-            self.speed_baseline = random.uniform(1220, 1320)  # Low speed
-            self.torque_baseline = random.uniform(62, 70)  # Very high torque
-            self.degradation_rate = random.uniform(0.2, 0.35)  # Controlled
-        else:
-            # Default to healthy
-            self.tool_wear = random.uniform(5, 40)
-            self.air_temp_baseline = random.uniform(296, 300)
-            self.process_temp_baseline = random.uniform(306, 310)
-            self.speed_baseline = random.uniform(1500, 2000)
-            self.torque_baseline = random.uniform(25, 40)
-            self.degradation_rate = random.uniform(0.2, 0.4)
-        
-        # Operating mode
-        self.operating_mode = "normal"
-        self.cycles = 0
+    # Reading layout, copied per tick so key order is fixed and only values are set
+    _TEMPLATE = {
+        'machine_id': None,
+        'Type': None,
+        'Air temperature [K]': 0.0,
+        'Process temperature [K]': 0.0,
+        'Rotational speed [rpm]': 0,
+        'Torque [Nm]': 0.0,
+        'Tool wear [min]': 0,
+        'timestamp': '',
+        'operating_mode': 'normal',
+        'cycles': 0
+    }
+    
+    def __init__(self, simulator, index):
+        self._sim = simulator
+        self._index = index
+    
+    @property
+    def machine_id(self):
+        return self._sim.machine_ids[self._index]
+    
+    @property
+    def machine_type(self):
+        return self._sim.machine_type[self._index]
+    
+    @property
+    def operating_mode(self):
+        return self._sim.operating_mode[self._index]
+    
+    @property
+    def cycles(self):
+        return int(self._sim.cycles[self._index])
+    
+    @cycles.setter
+    def cycles(self, value):
+        self._sim.cycles[self._index] = value
+    
+    @property
+    def tool_wear(self):
+        return float(self._sim.tool_wear[self._index])
+    
+    @tool_wear.setter
+    def tool_wear(self, value):
+        self._sim.tool_wear[self._index] = value
+    
+    @property
+    def air_temp_baseline(self):
+        return float(self._sim.air_temp_baseline[self._index])
+    
+    @air_temp_baseline.setter
+    def air_temp_baseline(self, value):
+        self._sim.air_temp_baseline[self._index] = value
+    
+    @property
+    def speed_baseline(self):
+        return float(self._sim.speed_baseline[self._index])
+    
+    @speed_baseline.setter
+    def speed_baseline(self, value):
+        self._sim.speed_baseline[self._index] = value
+    
+    @property
+    def torque_baseline(self):
+        return float(self._sim.torque_baseline[self._index])
+    
+    @torque_baseline.setter
+    def torque_baseline(self, value):
+        self._sim.torque_baseline[self._index] = value
+    
+    @property
+    def degradation_rate(self):
+        return float(self._sim.degradation_rate[self._index])
+    
+    @degradation_rate.setter
+    def degradation_rate(self, value):
+        self._sim.degradation_rate[self._index] = value
         
     def generate_sensor_data(self):
         """
@@ -64,79 +223,58 @@ class MachineSimulator:
         """
         self.cycles += 1
         
-        # GRADUAL tool wear increase (much slower, realistic)
-        wear_increment = self.degradation_rate * random.uniform(0.1, 0.3)  # Very small increments
-        self.tool_wear = min(self.tool_wear + wear_increment, 250)
-        
-        # Generate correlated sensor readings with minimal noise for gradual changes
-        # Air temperature - very slow variations
-        air_temp_noise = random.gauss(0, 0.2)  # Reduced noise
-        air_temp = np.clip(
-            self.air_temp_baseline + air_temp_noise,
-            *config.SENSOR_RANGES['Air temperature [K]']
-        )
-        
-        # Process temperature - correlated with air temp, slightly increases with tool wear
-        wear_factor = self.tool_wear / 250.0  # 0 to 1
-        process_temp_base = air_temp + random.uniform(8, 12)
-        process_temp_noise = random.gauss(0, 0.3) + wear_factor * 1.0  # Reduced impact
-        process_temp = np.clip(
-            process_temp_base + process_temp_noise,
-            *config.SENSOR_RANGES['Process temperature [K]']
-        )
-        
-        # Rotational speed - very stable with minor variations
-        speed_noise = random.gauss(0, 20)  # Reduced from 50
-        speed = np.clip(
-            self.speed_baseline + speed_noise,
-            *config.SENSOR_RANGES['Rotational speed [rpm]']
-        )
-        
-        # Torque - stable with slight variations based on wear
-        base_torque = self.torque_baseline
-        if wear_factor > 0.6:  # High wear increases torque slightly
-            base_torque += random.uniform(0, 3)  # Reduced from 10
-        
-        torque_noise = random.gauss(0, 1.5)  # Reduced from 3
-        torque = np.clip(
-            base_torque + torque_noise,
-            *config.SENSOR_RANGES['Torque [Nm]']
+        self.tool_wear, air_temp, process_temp, speed, torque = _tick(
+            self.tool_wear,
+            self.air_temp_baseline,
+            self.speed_baseline,
+            self.torque_baseline,
+            self.degradation_rate,
+            _RNG.normal(0, _NOISE_SIGMAS),
+            _RNG.random(3),
+            _CLIP_BOUNDS
         )
         
         # Very gradual baseline drift (simulate aging over many cycles)
         if self.cycles % 100 == 0:
-            self.air_temp_baseline += random.uniform(-0.1, 0.1)
-            self.speed_baseline += random.uniform(-5, 5)
-            self.torque_baseline += random.uniform(-0.5, 0.5)
+            self.air_temp_baseline += _RNG.uniform(-0.1, 0.1)
+            self.speed_baseline += _RNG.uniform(-5, 5)
+            self.torque_baseline += _RNG.uniform(-0.5, 0.5)
         
-        return {
-            'machine_id': self.machine_id,
-            'Type': self.machine_type,
-            'Air temperature [K]': round(air_temp, 1),
-            'Process temperature [K]': round(process_temp, 1),
-            'Rotational speed [rpm]': int(speed),
-            'Torque [Nm]': round(torque, 1),
-            'Tool wear [min]': int(self.tool_wear),
-            'timestamp': datetime.now().isoformat(),
-            'operating_mode': self.operating_mode,
-            'cycles': self.cycles
-        }
+        reading = self._TEMPLATE.copy()
+        reading['machine_id'] = self.machine_id
+        reading['Type'] = self.machine_type
+        # Native floats, so readings serialize without a cleaning pass
+        reading['Air temperature [K]'] = round(float(air_temp), 1)
+        reading['Process temperature [K]'] = round(float(process_temp), 1)
+        reading['Rotational speed [rpm]'] = int(speed)
+        reading['Torque [Nm]'] = round(float(torque), 1)
+        reading['Tool wear [min]'] = int(self.tool_wear)
+        reading['timestamp'] = datetime.now().isoformat()
+        reading['operating_mode'] = self.operating_mode
+        reading['cycles'] = self.cycles
+        return reading
     
     def reset_tool_wear(self):
         """Simulate maintenance - reset tool wear to healthy state"""
-        self.tool_wear = random.uniform(0, 20)  # Fresh after maintenance
-        self.degradation_rate = random.uniform(0.2, 0.5)  # Reset to slow degradation
+        self.tool_wear = _RNG.uniform(0, 20)  # Fresh after maintenance
+        self.degradation_rate = _RNG.uniform(0.2, 0.5)  # Reset to slow degradation
         print(f"  🔧 Maintenance performed on {self.machine_id} - Tool wear reset to {int(self.tool_wear)}min")
 
 
 class DataSimulator:
     """
     Manages multiple machine simulators
+    
+    Machine state is kept as parallel NumPy arrays (one entry per machine) so
+    that a simulation tick for all machines is a handful of vectorized ops.
     """
     
     def __init__(self, num_machines=None):
         self.num_machines = num_machines or config.NUM_MACHINES
-        self.machines = []
+        
+        # Guards the state arrays: ticks and maintenance can come from API worker
+        # threads and the background simulation at the same time
+        self._lock = threading.Lock()
         
         # Define initial conditions for machines
         # 3 healthy, 1 at risk, 1 requiring maintenance
@@ -147,39 +285,132 @@ class DataSimulator:
             conditions.append('healthy')
         
         # Initialize machines with specific conditions
-        for i in range(self.num_machines):
-            machine_id = f"M{str(i+1).zfill(3)}"
-            machine_type = random.choice(config.SENSOR_RANGES['Type'])
-            condition = conditions[i] if i < len(conditions) else 'healthy'
-            machine = MachineSimulator(machine_id, machine_type, initial_condition=condition)
-            self.machines.append(machine)
+        ranges = [_INITIAL_CONDITIONS.get(conditions[i], _INITIAL_CONDITIONS['default'])
+                  for i in range(self.num_machines)]
+        
+        def draw(field):
+            low, high = np.array([r[field] for r in ranges], dtype=np.float64).T
+            return _RNG.uniform(low, high)
+        
+        self.machine_ids = tuple(f"M{i+1:03d}" for i in range(self.num_machines))
+        self.machine_type = np.array(SENSOR_TYPES, dtype=object)[
+            _RNG.integers(len(SENSOR_TYPES), size=self.num_machines)
+        ]
+        self.tool_wear = draw('tool_wear')
+        self.air_temp_baseline = draw('air_temp_baseline')
+        self.process_temp_baseline = draw('process_temp_baseline')
+        self.speed_baseline = draw('speed_baseline')
+        self.torque_baseline = draw('torque_baseline')
+        self.degradation_rate = draw('degradation_rate')
+        
+        # Operating mode
+        self.operating_mode = ["normal"] * self.num_machines
+        self.cycles = np.zeros(self.num_machines, dtype=np.int64)
+        
+        self.machines = [MachineSimulator(self, i) for i in range(self.num_machines)]
+        self._by_id = {m.machine_id: m for m in self.machines}
         
         print(f"✓ Initialized {self.num_machines} machine simulators")
-        for machine in self.machines:
-            status = "HEALTHY" if machine.tool_wear < 50 else ("AT RISK" if machine.tool_wear < 150 else "MAINTENANCE")
-            print(f"  - {machine.machine_id} (Type: {machine.machine_type}, Tool Wear: {int(machine.tool_wear)}min, Status: {status})")
+        if config.DEBUG:
+            for machine in self.machines:
+                status = "HEALTHY" if machine.tool_wear < 50 else ("AT RISK" if machine.tool_wear < 150 else "MAINTENANCE")
+                print(f"  - {machine.machine_id} (Type: {machine.machine_type}, Tool Wear: {int(machine.tool_wear)}min, Status: {status})")
 
+    def _generate_all(self):
+        """
+        Generate sensor data for all machines in one vectorized step
+        
+        Mirrors MachineSimulator.generate_sensor_data across the state arrays.
+        """
+        rng = _RNG
+        n = self.num_machines
+        self.cycles += 1
+        
+        # GRADUAL tool wear increase
+        wear_increment = self.degradation_rate * rng.uniform(0.1, 0.3, n)
+        np.minimum(self.tool_wear + wear_increment, _WEAR_HI, out=self.tool_wear)
+        
+        noise = rng.standard_normal((4, n)) * _NOISE_SIGMAS[:, None]
+        
+        air_temp = np.clip(
+            self.air_temp_baseline + noise[0],
+            _AIR_LO, _AIR_HI
+        )
+        
+        wear_factor = self.tool_wear / 250.0
+        process_temp = np.clip(
+            air_temp + rng.uniform(8, 12, n) + noise[1] + wear_factor * 1.0,
+            _PROC_LO, _PROC_HI
+        )
+        
+        speed = np.clip(
+            self.speed_baseline + noise[2],
+            _SPEED_LO, _SPEED_HI
+        )
+        
+        # High wear increases torque slightly
+        base_torque = self.torque_baseline + np.where(wear_factor > 0.6, rng.uniform(0, 3, n), 0.0)
+        torque = np.clip(
+            base_torque + noise[3],
+            _TORQUE_LO, _TORQUE_HI
+        )
+        
+        # Very gradual baseline drift (simulate aging over many cycles)
+        drift = self.cycles % 100 == 0
+        if drift.any():
+            k = int(drift.sum())
+            self.air_temp_baseline[drift] += rng.uniform(-0.1, 0.1, k)
+            self.speed_baseline[drift] += rng.uniform(-5, 5, k)
+            self.torque_baseline[drift] += rng.uniform(-0.5, 0.5, k)
+        
+        # One timestamp per tick, shared by all machines
+        timestamp = datetime.now().isoformat()
+        
+        return [{
+            'machine_id': machine_id,
+            'Type': machine_type,
+            'Air temperature [K]': air,
+            'Process temperature [K]': proc,
+            'Rotational speed [rpm]': rpm,
+            'Torque [Nm]': trq,
+            'Tool wear [min]': wear,
+            'timestamp': timestamp,
+            'operating_mode': mode,
+            'cycles': cycles
+        } for machine_id, machine_type, air, proc, rpm, trq, wear, mode, cycles in zip(
+            self.machine_ids,
+            self.machine_type,
+            np.round(air_temp, 1).tolist(),
+            np.round(process_temp, 1).tolist(),
+            speed.astype(np.int64).tolist(),
+            np.round(torque, 1).tolist(),
+            self.tool_wear.astype(np.int64).tolist(),
+            self.operating_mode,
+            self.cycles.tolist()
+        )]
     
     def generate_data(self, machine_id=None):
         """
         Generate sensor data for one or all machines
         """
-        if machine_id:
-            machine = next((m for m in self.machines if m.machine_id == machine_id), None)
-            if machine:
-                return machine.generate_sensor_data()
+        with self._lock:
+            if machine_id:
+                machine = self._by_id.get(machine_id)
+                if machine:
+                    return machine.generate_sensor_data()
+                else:
+                    raise ValueError(f"Machine {machine_id} not found")
             else:
-                raise ValueError(f"Machine {machine_id} not found")
-        else:
-            return [machine.generate_sensor_data() for machine in self.machines]
+                return self._generate_all()
     
     def perform_maintenance(self, machine_id):
         """
         Perform maintenance on a specific machine
         """
-        machine = next((m for m in self.machines if m.machine_id == machine_id), None)
+        machine = self._by_id.get(machine_id)
         if machine:
-            machine.reset_tool_wear()
+            with self._lock:
+                machine.reset_tool_wear()
             return True
         return False
     
@@ -187,14 +418,38 @@ class DataSimulator:
         """
         Get information about all machines
         """
-        return [{
-            'machine_id': m.machine_id,
-            'type': m.machine_type,
-            'tool_wear': int(m.tool_wear),
-            'operating_mode': m.operating_mode,
-            'cycles': m.cycles,
-            'degradation_rate': round(m.degradation_rate, 2)
-        } for m in self.machines]
+        with self._lock:
+            return [{
+                'machine_id': m.machine_id,
+                'type': m.machine_type,
+                'tool_wear': int(m.tool_wear),
+                'operating_mode': m.operating_mode,
+                'cycles': m.cycles,
+                'degradation_rate': round(m.degradation_rate, 2)
+            } for m in self.machines]
+    
+    def _print_simulation_header(self, interval):
+        """Print the banner shown when a continuous simulation starts"""
+        print(f"\n{'='*60}")
+        print("STARTING CONTINUOUS SIMULATION")
+        print(f"{'='*60}")
+        print(f"Interval: {interval} seconds")
+        print(f"Machines: {self.num_machines}")
+        print("Press Ctrl+C to stop\n")
+    
+    def _print_iteration(self, iteration, data):
+        """Display an iteration summary (development only), written in one call"""
+        if not config.DEBUG:
+            return
+        parts = [f"\n[Iteration {iteration}] {datetime.now().strftime('%H:%M:%S')}\n"]
+        for machine_data in data:
+            parts.append(f"  {machine_data['machine_id']}: "
+                         f"Temp={machine_data['Process temperature [K]']:.1f}K, "
+                         f"Speed={machine_data['Rotational speed [rpm]']}rpm, "
+                         f"Torque={machine_data['Torque [Nm]']:.1f}Nm, "
+                         f"Wear={machine_data['Tool wear [min]']}min\n")
+        sys.stdout.write("".join(parts))
+        sys.stdout.flush()
     
     def run_continuous_simulation(self, callback=None, interval=None):
         """
@@ -206,12 +461,7 @@ class DataSimulator:
         """
         interval = interval or config.SIMULATION_INTERVAL
         
-        print(f"\n{'='*60}")
-        print("STARTING CONTINUOUS SIMULATION")
-        print(f"{'='*60}")
-        print(f"Interval: {interval} seconds")
-        print(f"Machines: {self.num_machines}")
-        print("Press Ctrl+C to stop\n")
+        self._print_simulation_header(interval)
         
         try:
             iteration = 0
@@ -221,14 +471,7 @@ class DataSimulator:
                 # Generate data for all machines
                 data = self.generate_data()
                 
-                # Display summary
-                print(f"\n[Iteration {iteration}] {datetime.now().strftime('%H:%M:%S')}")
-                for machine_data in data:
-                    print(f"  {machine_data['machine_id']}: "
-                          f"Temp={machine_data['Process temperature [K]']:.1f}K, "
-                          f"Speed={machine_data['Rotational speed [rpm]']}rpm, "
-                          f"Torque={machine_data['Torque [Nm]']:.1f}Nm, "
-                          f"Wear={machine_data['Tool wear [min]']}min")
+                self._print_iteration(iteration, data)
                 
                 # Call callback if provided
                 if callback:
@@ -239,6 +482,46 @@ class DataSimulator:
                 
         except KeyboardInterrupt:
             print("\n\n✓ Simulation stopped by user")
+    
+    async def run_continuous_simulation_async(self, callback=None, interval=None):
+        """
+        Run continuous simulation loop without blocking the event loop
+        
+        Ticks are scheduled against fixed deadlines so the time spent generating
+        data does not make the interval drift. Stop it by cancelling the task.
+        
+        Args:
+            callback: Function to call with generated data
+            interval: Time interval between generations (seconds)
+        """
+        interval = interval or config.SIMULATION_INTERVAL
+        
+        self._print_simulation_header(interval)
+        
+        loop = asyncio.get_running_loop()
+        next_deadline = loop.time()
+        try:
+            iteration = 0
+            while True:
+                iteration += 1
+                
+                # Generate data for all machines in a worker thread; the simulator
+                # lock may be held by API requests and must not block the event loop
+                data = await asyncio.to_thread(self.generate_data)
+                
+                self._print_iteration(iteration, data)
+                
+                # Call callback if provided
+                if callback:
+                    callback(data)
+                
+                # Wait for next iteration
+                next_deadline += interval
+                await asyncio.sleep(max(0, next_deadline - loop.time()))
+                
+        except asyncio.CancelledError:
+            print("✓ Simulation stopped")
+            raise
 
 
 # Create global simulator instance
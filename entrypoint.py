@@ -10,26 +10,35 @@ def main():
     # Get port from environment or use default
     port = int(os.getenv('PORT', 8000))
     host = os.getenv('HOST', '0.0.0.0')
+    # Single worker by default - each worker process runs its own simulator, so
+    # more than one (opt-in via WEB_CONCURRENCY) gives clients diverging machine state
+    workers = int(os.getenv('WEB_CONCURRENCY', 1))
     
     print("=" * 50)
     print("🚀 Starting Predictive Maintenance API")
     print("=" * 50)
     print(f"Host: {host}")
     print(f"Port: {port}")
+    print(f"Workers: {workers}")
     print(f"Environment: {os.getenv('ENV', 'production')}")
     print("=" * 50)
     
     # Import and run
     try:
         import uvicorn
-        from app import app
+        import config
         
+        # The app is passed as an import string so each worker imports it itself
         uvicorn.run(
-            app,
+            "app:app",
             host=host,
             port=port,
+            workers=workers,
             log_level="info",
-            access_log=True
+            access_log=config.ACCESS_LOG,
+            loop=config.SERVER_LOOP,
+            http=config.SERVER_HTTP,
+            lifespan="on"
         )
     except Exception as e:
         print(f"❌ Failed to start: {e}")
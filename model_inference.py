@@ -4,26 +4,125 @@ Model Inference Module for Predictive Maintenance
 import joblib
 import json
 import os
+import threading
 import numpy as np
-import pandas as pd
+from cachetools import LRUCache
 import config
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional - fall back to plain Python
+    def njit(*args, **kwargs):
+        return lambda f: f
 
-class ModelInference:
+try:
+    import onnxruntime as ort
+except ImportError:  # onnxruntime is optional - fall back to the pickled model
+    ort = None
+
+
+# Raw sensor columns, in the order used by predict_rows
+SENSOR_COLUMNS = (
+    'Air temperature [K]',
+    'Process temperature [K]',
+    'Rotational speed [rpm]',
+    'Torque [Nm]',
+    'Tool wear [min]'
+)
+
+# Fixed layout the feature matrix is built in; reordered to the model's columns at load time
+FEATURE_NAMES = (
+    'Air_temperature_K',
+    'Process_temperature_K',
+    'Rotational_speed_rpm',
+    'Torque_Nm',
+    'Tool_wear_min',
+    'Type_encoded',
+    'Temp_diff',
+    'Power'
+)
+
+# Each raw sensor column paired with its cleaned (training) name, accepted as input too
+SENSOR_ALIASES = tuple(zip(SENSOR_COLUMNS, (
+    'Air_temperature_K',
+    'Process_temperature_K',
+    'Rotational_speed_rpm',
+    'Torque_Nm',
+    'Tool_wear_min'
+)))
+
+# Health status buckets from config, sorted by lower bound; the buckets tile [0, 1)
+# so a probability's bucket is the first upper bound above it. The extra
+# trailing label covers probabilities at or past the last upper bound.
+_STATUS_BUCKETS = sorted(config.HEALTH_STATUS.items(), key=lambda kv: kv[1][0])
+_STATUS_HI = np.array([hi for _, (_, hi) in _STATUS_BUCKETS], dtype=np.float64)
+_STATUS_LABELS = np.array(
+    [status.upper().replace('_', ' ') for status, _ in _STATUS_BUCKETS] + ["MAINTENANCE REQUIRED"],
+    dtype=object
+)
+
+
+@njit(cache=True)
+def build_features(air, proc, speed, torque, wear, type_enc, out):
+    """
+    Write the feature matrix into out (shape (N, 8), FEATURE_NAMES layout)
+    """
+    for i in range(out.shape[0]):
+        out[i, 0] = air[i]
+        out[i, 1] = proc[i]
+        out[i, 2] = speed[i]
+        out[i, 3] = torque[i]
+        out[i, 4] = wear[i]
+        out[i, 5] = type_enc[i]
+        out[i, 6] = proc[i] - air[i]  # Temp_diff
+        out[i, 7] = torque[i] * speed[i] / 1000  # Power
+    return out
+
+
+class Singleton(type):
+    """
+    Metaclass that hands out a single instance per class, created under a lock
+    """
+    _instances = {}
+    _lock = threading.Lock()
+    
+    def __call__(cls, *args, **kwargs):
+        if cls not in cls._instances:
+            with cls._lock:
+                if cls not in cls._instances:
+                    cls._instances[cls] = super().__call__(*args, **kwargs)
+        return cls._instances[cls]
+
+
+class ModelInference(metaclass=Singleton):
     """
     Handle model loading and inference for predictive maintenance
     """
     
+    # Sensor keys (either naming) whose values may arrive as numpy scalars
+    _NUMERIC_KEYS = frozenset(name for pair in SENSOR_ALIASES for name in pair)
+    
     def __init__(self):
         self.model = None
+        self.session = None
+        self._onnx_input = None
         self.label_encoder = None
+        self._type_map = None
         self.feature_columns = None
+        self._feat_idx = None
+        self._feat_identity = False
         self.metadata = None
         self.model_loaded = False
+        self._pred_cache = LRUCache(maxsize=config.PREDICTION_CACHE_SIZE)
+        self._cache_lock = threading.Lock()
         
     def load_model(self, model_name=None):
         """
         Load the trained model and associated artifacts
+        
+        Everything is loaded into locals first and swapped in together, so
+        concurrent predictions see either the old model or the new one, and a
+        failed reload keeps the previously loaded model in service.
         """
         try:
             # Load metadata to get model name and features
@@ -35,79 +134,188 @@ class ModelInference:
                 )
             
             with open(metadata_path, 'r') as f:
-                self.metadata = json.load(f)
+                metadata = json.load(f)
             
             # Use metadata model name if not specified
             if model_name is None:
-                model_name = self.metadata['model_name']
+                model_name = metadata['model_name']
             
-            # Load model
-            model_path = os.path.join(config.MODEL_DIR, f'{model_name}.pkl')
-            self.model = joblib.load(model_path)
+            # Load model - prefer the ONNX export recorded for this training run
+            # when onnxruntime is available
+            model, session, onnx_input = None, None, None
+            onnx_file = metadata.get('onnx_model')
+            if model_name != metadata['model_name']:
+                onnx_file = None
+            if ort is not None and onnx_file:
+                onnx_path = os.path.join(config.MODEL_DIR, onnx_file)
+                session = ort.InferenceSession(onnx_path, providers=['CPUExecutionProvider'])
+                onnx_input = session.get_inputs()[0].name
+            else:
+                model_path = os.path.join(config.MODEL_DIR, f'{model_name}.pkl')
+                # Memory-map the model's arrays so workers share one copy of the pages
+                model = joblib.load(model_path, mmap_mode='r')
             
             # Load label encoder
             encoder_path = os.path.join(config.MODEL_DIR, 'label_encoder.pkl')
-            self.label_encoder = joblib.load(encoder_path)
-            
-            # Load feature columns
-            self.feature_columns = self.metadata['feature_columns']
-            
-            self.model_loaded = True
-            
-            print(f"✓ Model loaded successfully: {model_name}")
-            print(f"  Training date: {self.metadata['training_date']}")
-            print(f"  Metrics: {self.metadata['metrics']}")
+            label_encoder = joblib.load(encoder_path)
+            type_map = {cls: i for i, cls in enumerate(label_encoder.classes_)}
             
-            return True
+            # Load feature columns once, as a tuple plus the column index into FEATURE_NAMES
+            feature_columns = tuple(metadata['feature_columns'])
+            feat_idx = np.fromiter(
+                (FEATURE_NAMES.index(name) for name in feature_columns),
+                dtype=np.intp, count=len(feature_columns)
+            )
+            feat_idx.flags.writeable = False
             
         except Exception as e:
             print(f"✗ Error loading model: {str(e)}")
-            self.model_loaded = False
             return False
+        
+        with self._cache_lock:
+            self.metadata = metadata
+            self.model = model
+            self.session = session
+            self._onnx_input = onnx_input
+            self.label_encoder = label_encoder
+            self._type_map = type_map
+            self.feature_columns = feature_columns
+            self._feat_idx = feat_idx
+            # Skip the reindexing copy when the model already uses the build order
+            self._feat_identity = feature_columns == FEATURE_NAMES
+            # Fresh cache for the new model; in-flight scoring of the old model
+            # writes into the old cache object, which is dropped
+            self._pred_cache = LRUCache(maxsize=config.PREDICTION_CACHE_SIZE)
+            self.model_loaded = True
+        
+        print(f"✓ Model loaded successfully: {model_name} ({'onnxruntime' if session else 'joblib'})")
+        print(f"  Training date: {metadata['training_date']}")
+        print(f"  Metrics: {metadata['metrics']}")
+        
+        return True
     
     def preprocess_input(self, sensor_data):
         """
         Preprocess input sensor data for prediction
         
         Args:
-            sensor_data (dict): Dictionary containing sensor values
+            sensor_data (dict or list): Dictionary (or list of dictionaries) containing sensor values
                 Required keys: 'Type', 'Air temperature [K]', 'Process temperature [K]',
                               'Rotational speed [rpm]', 'Torque [Nm]', 'Tool wear [min]'
         
         Returns:
-            np.array: Preprocessed features ready for prediction
+            np.array: Preprocessed features ready for prediction, one row per record
+        """
+        return self._build_features(*self._extract_rows(sensor_data))
+    
+    def _extract_rows(self, sensor_data):
         """
+        Pull raw sensor arrays and encoded types out of sensor dicts
+        
+        Returns:
+            tuple: (sensor_rows of shape (N, 5) in SENSOR_COLUMNS order, encoded types)
+        """
+        if isinstance(sensor_data, dict):
+            sensor_data = [sensor_data]
+        
         # Encode Type
-        type_encoded = self.label_encoder.transform([sensor_data['Type']])[0]
+        type_encoded = [self._type_map[data['Type']] for data in sensor_data]
         
         # Extract sensor values (handle both formats)
-        air_temp = sensor_data.get('Air temperature [K]') or sensor_data.get('Air_temperature_K')
-        process_temp = sensor_data.get('Process temperature [K]') or sensor_data.get('Process_temperature_K')
-        speed = sensor_data.get('Rotational speed [rpm]') or sensor_data.get('Rotational_speed_rpm')
-        torque = sensor_data.get('Torque [Nm]') or sensor_data.get('Torque_Nm')
-        tool_wear = sensor_data.get('Tool wear [min]') or sensor_data.get('Tool_wear_min')
-        
-        # Calculate engineered features
-        temp_diff = process_temp - air_temp
-        power = torque * speed / 1000
-        
-        # Create feature dictionary in correct order (using cleaned names)
-        features = {
-            'Air_temperature_K': air_temp,
-            'Process_temperature_K': process_temp,
-            'Rotational_speed_rpm': speed,
-            'Torque_Nm': torque,
-            'Tool_wear_min': tool_wear,
-            'Type_encoded': type_encoded,
-            'Temp_diff': temp_diff,
-            'Power': power
-        }
+        sensor_rows = np.array([
+            [data[key] if key in data else data.get(alias) for key, alias in SENSOR_ALIASES]
+            for data in sensor_data
+        ], dtype=np.float64)
+        
+        return sensor_rows, type_encoded
+    
+    def _build_features(self, sensor_rows, type_encoded):
+        """
+        Build the model feature matrix from raw sensor rows
         
-        # Create DataFrame with features in correct order
-        df = pd.DataFrame([features])
-        df = df[self.feature_columns]
+        Args:
+            sensor_rows (np.ndarray): Array of shape (N, 5) with the values of SENSOR_COLUMNS
+            type_encoded (np.ndarray): Encoded machine type per row
         
-        return df.values
+        Returns:
+            np.array: Features of shape (N, n_features) in the model's column order
+        """
+        features = np.empty((sensor_rows.shape[0], len(FEATURE_NAMES)), dtype=np.float64)
+        build_features(
+            sensor_rows[:, 0], sensor_rows[:, 1], sensor_rows[:, 2],
+            sensor_rows[:, 3], sensor_rows[:, 4],
+            np.asarray(type_encoded, dtype=np.float64), features
+        )
+        
+        if self._feat_identity:
+            return features
+        return features[:, self._feat_idx]
+    
+    def _predict_proba(self, features):
+        """
+        Class probabilities for a feature matrix, from ONNX Runtime when loaded
+        """
+        session, onnx_input, model = self.session, self._onnx_input, self.model
+        if session is not None:
+            # Outputs are (label, probabilities)
+            return session.run(None, {onnx_input: features.astype(np.float32)})[1]
+        return model.predict_proba(features)
+    
+    def _cached_proba(self, sensor_rows, type_encoded):
+        """
+        Class probabilities per row, reusing cached results for repeated readings
+        
+        Rows are keyed on their machine type and exact sensor values, so a hit
+        returns the same probabilities the model would; only readings not seen
+        recently go through the model.
+        """
+        keys = [(t, *row) for t, row in zip(type_encoded, sensor_rows.tolist())]
+        
+        # Bound once: a reload swaps in a new cache, and results from the old
+        # model must not land in it
+        cache = self._pred_cache
+        probabilities = np.empty((len(keys), 2), dtype=np.float64)
+        misses = []
+        with self._cache_lock:
+            for i, key in enumerate(keys):
+                cached = cache.get(key)
+                if cached is None:
+                    misses.append(i)
+                else:
+                    probabilities[i] = cached
+        
+        if misses:
+            miss_proba = self._predict_proba(
+                self._build_features(sensor_rows[misses], [type_encoded[i] for i in misses])
+            )
+            probabilities[misses] = miss_proba
+            with self._cache_lock:
+                for i, proba in zip(misses, miss_proba.tolist()):
+                    cache[keys[i]] = proba
+        
+        return probabilities
+    
+    def _score(self, sensor_rows, type_encoded):
+        """
+        Score raw sensor rows
+        
+        Returns:
+            tuple: (predictions, probabilities rounded to 4 decimals, health statuses,
+                alerts), one entry per row
+        """
+        probabilities = self._cached_proba(sensor_rows, type_encoded)
+        failure_probs = probabilities[:, 1]
+        
+        # Same decision rule as the classifier's predict(), without a second model pass
+        predictions = (failure_probs > 0.5).astype(int)
+        alerts = failure_probs >= config.FAILURE_THRESHOLD
+        
+        health_statuses = _STATUS_LABELS[
+            np.searchsorted(_STATUS_HI, failure_probs, side='right')
+        ].tolist()
+        
+        # Probabilities are reported to 4 decimals; round the whole batch at once
+        return predictions, np.round(probabilities, 4), health_statuses, alerts
     
     def predict(self, sensor_data):
         """
@@ -128,53 +336,91 @@ class ModelInference:
         
         predictions = []
         
-        for data in sensor_data:
-            # Preprocess input
-            features = self.preprocess_input(data)
-            
-            # Get prediction and probability
-            prediction = self.model.predict(features)[0]
-            probability = self.model.predict_proba(features)[0]
-            
-            # Determine health status
-            failure_prob = float(probability[1])  # Convert numpy.float to Python float
-            health_status = self._get_health_status(failure_prob)
-            
+        # Preprocess and score all inputs in one pass
+        batch_predictions, batch_probabilities, batch_statuses, batch_alerts = self._score(
+            *self._extract_rows(sensor_data)
+        )
+        
+        for data, prediction, probability, health_status, alert in zip(
+                sensor_data, batch_predictions.tolist(), batch_probabilities.tolist(),
+                batch_statuses, batch_alerts.tolist()):
             # Clean sensor_data to ensure all values are JSON-serializable
-            clean_sensor_data = {}
-            for key, value in data.items():
-                if isinstance(value, (np.integer, np.floating)):
-                    clean_sensor_data[key] = float(value)
-                elif isinstance(value, np.ndarray):
-                    clean_sensor_data[key] = value.tolist()
-                elif isinstance(value, np.bool_):
-                    clean_sensor_data[key] = bool(value)
-                else:
-                    clean_sensor_data[key] = value
+            clean_sensor_data = {
+                key: (value.item() if key in self._NUMERIC_KEYS and isinstance(value, np.generic) else value)
+                for key, value in data.items()
+            }
             
             result = {
                 'machine_id': data.get('machine_id', 'Unknown'),
-                'prediction': int(prediction),  # Convert numpy.int to Python int
-                'failure_probability': round(failure_prob, 4),
-                'normal_probability': round(float(probability[0]), 4),  # Convert to float
+                'prediction': prediction,
+                'failure_probability': probability[1],
+                'normal_probability': probability[0],
                 'health_status': health_status,
                 'sensor_data': clean_sensor_data,
-                'alert': bool(failure_prob >= config.FAILURE_THRESHOLD)  # Convert to bool
+                'alert': alert
             }
             
             predictions.append(result)
         
         return predictions if len(predictions) > 1 else predictions[0]
     
-    def _get_health_status(self, failure_probability):
+    def predict_rows(self, sensor_rows, machine_types, machine_ids, timestamp=None):
         """
-        Determine health status based on failure probability
+        Make predictions for sensor readings already laid out as an array
+        
+        Args:
+            sensor_rows (np.ndarray): Array of shape (N, 5) with the values of
+                SENSOR_COLUMNS for each machine
+            machine_types (list): Machine type ('L', 'M' or 'H') per row
+            machine_ids (list): Machine identifier per row
+            timestamp (str, optional): Stamped on every result when given
+        
+        Returns:
+            list: Prediction result dict per row
         """
-        for status, (min_prob, max_prob) in config.HEALTH_STATUS.items():
-            if min_prob <= failure_probability < max_prob:
-                return status.upper().replace('_', ' ')
+        if not self.model_loaded:
+            raise RuntimeError("Model not loaded. Call load_model() first.")
         
-        return "MAINTENANCE REQUIRED"
+        sensor_rows = np.asarray(sensor_rows, dtype=np.float64)
+        batch_predictions, batch_probabilities, batch_statuses, batch_alerts = self._score(
+            sensor_rows, [self._type_map[t] for t in machine_types]
+        )
+        
+        predictions = []
+        for row, machine_type, machine_id, prediction, probability, health_status, alert in zip(
+                sensor_rows.tolist(), machine_types, machine_ids,
+                batch_predictions.tolist(), batch_probabilities.tolist(),
+                batch_statuses, batch_alerts.tolist()):
+            result = {
+                'machine_id': machine_id,
+                'prediction': prediction,
+                'failure_probability': probability[1],
+                'normal_probability': probability[0],
+                'health_status': health_status,
+                'sensor_data': {
+                    'machine_id': machine_id,
+                    'Type': machine_type,
+                    'Air temperature [K]': row[0],
+                    'Process temperature [K]': row[1],
+                    'Rotational speed [rpm]': int(row[2]),
+                    'Torque [Nm]': row[3],
+                    'Tool wear [min]': int(row[4])
+                },
+                'alert': alert
+            }
+            if timestamp is not None:
+                result['timestamp'] = timestamp
+            predictions.append(result)
+        
+        return predictions
+    
+    def predict_row(self, sensor_row, machine_type, machine_id, timestamp=None):
+        """
+        Make prediction for a single machine's sensor array (see predict_rows)
+        """
+        return self.predict_rows(
+            np.asarray(sensor_row)[None, :], [machine_type], [machine_id], timestamp=timestamp
+        )[0]
     
     def get_model_info(self):
         """
@@ -193,23 +439,23 @@ class ModelInference:
 
 
 # Singleton instance
-_model_inference = None
+_load_lock = threading.Lock()
 
 def get_model_inference():
     """
-    Get or create ModelInference singleton instance
+    Get the ModelInference singleton, loading the model on first use
     """
-    global _model_inference
-    if _model_inference is None:
-        _model_inference = ModelInference()
-        _model_inference.load_model()
-    return _model_inference
+    inference = ModelInference()
+    if not inference.model_loaded:
+        with _load_lock:
+            if not inference.model_loaded:
+                inference.load_model()
+    return inference
 
 
 if __name__ == "__main__":
     # Test inference
-    inference = ModelInference()
-    inference.load_model()
+    inference = get_model_inference()
     
     # Sample sensor data
     test_data = {
@@ -3,6 +3,7 @@ Integrated monitoring system that combines data simulation and prediction
 """
 import asyncio
 from fastapi import APIRouter
+from fastapi.concurrency import run_in_threadpool
 from typing import List, Dict
 from data_simulator import get_simulator
 from model_inference import get_model_inference
@@ -76,7 +77,7 @@ async def simulate_and_predict():
     This is the main endpoint used by the dashboard
     """
     service = get_monitoring_service()
-    predictions = service.get_real_time_predictions()
+    predictions = await run_in_threadpool(service.get_real_time_predictions)
     return predictions
 
 
@@ -86,7 +87,7 @@ async def get_machines_status():
     Get status information for all machines
     """
     service = get_monitoring_service()
-    status = service.get_machines_status()
+    status = await run_in_threadpool(service.get_machines_status)
     return status
 
 
@@ -96,7 +97,7 @@ async def perform_maintenance(machine_id: str):
     Perform maintenance on a specific machine (reset tool wear)
     """
     service = get_monitoring_service()
-    success = service.perform_maintenance(machine_id)
+    success = await run_in_threadpool(service.perform_maintenance, machine_id)
     
     if success:
         return {
@@ -117,5 +118,5 @@ async def predict_machine(machine_id: str):
     Get prediction for a specific machine
     """
     service = get_monitoring_service()
-    prediction = service.get_machine_prediction(machine_id)
+    prediction = await run_in_threadpool(service.get_machine_prediction, machine_id)
     return prediction
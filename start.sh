@@ -4,10 +4,16 @@
 # Get PORT from environment or use default
 PORT=${PORT:-8000}
 
+# Worker processes: 1 by default, since simulator state lives in each process;
+# set WEB_CONCURRENCY to opt in to more
+WORKERS=${WEB_CONCURRENCY:-1}
+
 echo "========================================="
 echo "  Predictive Maintenance API"
 echo "  Port: $PORT"
+echo "  Workers: $WORKERS"
 echo "========================================="
 
 # Start uvicorn
-exec uvicorn app:app --host 0.0.0.0 --port "$PORT" --log-level info
+exec uvicorn app:app --host 0.0.0.0 --port "$PORT" --log-level info \
+    --loop uvloop --http httptools --no-access-log --workers "$WORKERS"